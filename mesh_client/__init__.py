@@ -1,27 +1,52 @@
 import collections
 import contextlib
-import datetime
 import functools
 import hmac
+import itertools
+import json
 import os.path
 import platform
-import socket  # noqa: F401
+import shutil
+import socket
 import ssl
 import sys
+import tempfile
+import threading
+import time
 import uuid
 import warnings
+from collections import deque
 from dataclasses import dataclass
 from hashlib import sha256
 from io import BytesIO
-from itertools import chain
 from types import TracebackType
-from typing import Any, Dict, Generator, List, NoReturn, Optional, Tuple, Type, TypeVar, Union, cast
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    NoReturn,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    cast,
+)
 from urllib.parse import quote as q
 from urllib.parse import urlparse
 
 import requests
+import urllib3
 from requests import Response
-from requests.adapters import HTTPAdapter
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
+from urllib3.connection import HTTPConnection
 from urllib3.connectionpool import ConnectionPool
 from urllib3.exceptions import (
     ResponseError,
@@ -33,6 +58,7 @@ from .io_helpers import (
     CombineStreams,
     GzipCompressStream,
     GzipDecompressStream,
+    RewindableGzipCompressStream,
     SplitStream,
 )
 from .key_helper import get_shared_key_from_environ
@@ -45,18 +71,34 @@ from .types import (
     TrackingResponse_v2,
 )
 
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+try:
+    # faster json parsing of inbox listings and api responses when installed
+    from orjson import loads as _json_loads  # type: ignore[import]
+except ImportError:
+    from json import loads as _json_loads  # type: ignore[assignment]
+
+# requests.exceptions.JSONDecodeError was added in requests 2.27, before that response.json() raised json's own
+_JSONDecodeError = getattr(requests.exceptions, "JSONDecodeError", json.JSONDecodeError)
+
 if sys.version_info[:2] < (3, 8):
     warnings.warn("python 3.7 is now end of life", category=DeprecationWarning, stacklevel=2)
 
-if sys.version_info[:2] >= (3, 8):
-    # TODO: Import directly (no need for conditional) when `python_requires = >= 3.8`
-    from importlib.metadata import PackageNotFoundError, version
-else:
-    from importlib_metadata import PackageNotFoundError, version
-
 
+@functools.lru_cache(maxsize=None)
 def _get_version(*names: str) -> str:
-    """ """
+    """
+    looked up on first use rather than at import, importing importlib.metadata and scanning the installed
+    distributions is a noticeable part of the import time for short-lived scripts
+    """
+    if sys.version_info[:2] >= (3, 8):
+        # TODO: Import directly (no need for conditional) when `python_requires = >= 3.8`
+        from importlib.metadata import PackageNotFoundError, version
+    else:
+        from importlib_metadata import PackageNotFoundError, version
+
     for name in names:
         with contextlib.suppress(PackageNotFoundError):
             pkg_version = version(name)
@@ -64,7 +106,19 @@ def _get_version(*names: str) -> str:
     return "unknown"
 
 
-__version__ = _get_version("mesh-client")
+@functools.lru_cache(maxsize=None)
+def _platform_details() -> Tuple[str, str, str]:
+    """
+    os architecture, name and version for the client headers, these can shell out (uname -p) so only look them up once
+    """
+    return platform.processor() or platform.machine(), platform.system(), f"{platform.release()} {platform.version()}"
+
+
+def __getattr__(name: str) -> str:
+    if name == "__version__":
+        return _get_version("mesh-client")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 _PACKAGE_DIR = os.path.dirname(__file__)
 
@@ -107,6 +161,19 @@ _SEND_HEADERS.update(
 
 _BOOLEAN_HEADERS = {"compressed", "encrypted", "content_compressed", "content_encrypted"}
 
+# listed in the TypeError for an unrecognised send_message keyword argument
+_SEND_ARGS_HELP = ", ".join(["recipient", "data", *_OPTIONAL_HEADERS])
+
+
+def _yes_no(value: Any) -> str:
+    return "Y" if value else "N"
+
+
+# send_message kwarg -> (header, value formatter), resolved with one lookup per kwarg
+_SEND_HEADER_FORMATTERS: Dict[str, Tuple[str, Callable[[Any], str]]] = {
+    key: (header, _yes_no if key in _BOOLEAN_HEADERS else str) for key, header in _SEND_HEADERS.items()
+}
+
 _RECEIVE_HEADERS = {
     "sender": "Mex-From",
     "recipient": "Mex-To",
@@ -115,6 +182,17 @@ _RECEIVE_HEADERS = {
 }
 _RECEIVE_HEADERS.update(_OPTIONAL_HEADERS)
 
+# (attribute, lower case header name without the mex- prefix) for reading received message headers
+_RECEIVE_VALUE_KEYS = [
+    (attribute, header.lower()[4:])
+    for attribute, header in _RECEIVE_HEADERS.items()
+    if attribute not in _BOOLEAN_HEADERS
+]
+_RECEIVE_BOOLEAN_KEYS = [
+    (attribute, header.lower()[4:]) for attribute, header in _RECEIVE_HEADERS.items() if attribute in _BOOLEAN_HEADERS
+]
+_TRUE_VALUES = frozenset(("Y", "TRUE"))
+
 
 Endpoint = collections.namedtuple(
     "Endpoint", ["url", "verify", "cert", "check_hostname", "hostname_checks_common_name"]
@@ -127,11 +205,51 @@ DEP_ENDPOINT = Endpoint("https://msg.depspineservices.nhs.uk", DEP_CA_CERT, None
 INT_ENDPOINT = Endpoint("https://msg.intspineservices.nhs.uk", INT_CA_CERT, None, True, False)
 LIVE_ENDPOINT = Endpoint("https://mesh-sync.spineservices.nhs.uk", LIVE_CA_CERT, None, True, False)
 
-ENDPOINTS = [(name, endpoint) for name, endpoint in locals().items() if name.endswith("_ENDPOINT")]
+ENDPOINTS = [
+    ("DEPRECATED_HSCN_DEP_ENDPOINT", DEPRECATED_HSCN_DEP_ENDPOINT),
+    ("DEPRECATED_HSCN_INT_ENDPOINT", DEPRECATED_HSCN_INT_ENDPOINT),
+    ("DEPRECATED_HSCN_LIVE_ENDPOINT", DEPRECATED_HSCN_LIVE_ENDPOINT),
+    ("DEP_ENDPOINT", DEP_ENDPOINT),
+    ("INT_ENDPOINT", INT_ENDPOINT),
+    ("LIVE_ENDPOINT", LIVE_ENDPOINT),
+]
 
 
 _HOSTNAME_ENDPOINT_MAP = {urlparse(ep.url).hostname: ep for name, ep in ENDPOINTS}
 
+# the preconfigured urls are matched by prefix first, so the usual case does not need to parse the url
+_ENDPOINT_URL_PREFIXES = tuple((ep.url.lower(), ep) for name, ep in ENDPOINTS)
+
+
+TResult = TypeVar("TResult")
+
+
+def _prefetch(tasks: Iterable[Callable[[], TResult]], window: int) -> Generator[TResult, None, None]:
+    """
+    run tasks on a thread pool, keeping up to `window` in flight, and yield the results in order;
+    if iteration stops early any results already produced are closed
+    """
+    # concurrent.futures is only imported when threads are used, most clients never need it
+    from concurrent.futures import ThreadPoolExecutor
+
+    pending: Deque[Future] = deque()
+    with ThreadPoolExecutor(max_workers=window, thread_name_prefix="mesh_client") as executor:
+        try:
+            for task in tasks:
+                pending.append(executor.submit(task))
+                if len(pending) >= window:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                if future.cancel():
+                    continue
+                with contextlib.suppress(Exception):
+                    result = future.result()
+                    if hasattr(result, "close"):
+                        result.close()
+
 
 # urllib3 'futures' ( not part of 1.26 .. but available in  2.x )
 def reraise(
@@ -149,6 +267,12 @@ def reraise(
 
 
 def try_get_endpoint_from_url(url: str) -> Optional[Endpoint]:
+    url_lower = url.lower()
+    for prefix, endpoint in _ENDPOINT_URL_PREFIXES:
+        # the host must end at the prefix, not just start with it
+        if url_lower.startswith(prefix) and url_lower[len(prefix) : len(prefix) + 1] in ("", "/", ":"):
+            return Endpoint(url, *endpoint[1:])
+
     url_parsed = urlparse(url)
     if not url_parsed.hostname:
         return None
@@ -242,6 +366,78 @@ class MeshRetry(Retry):
         raise ResponseError(cause)
 
 
+# urllib3 already disables nagle (TCP_NODELAY), keepalive probes stop idle pooled connections being silently
+# dropped by firewalls between pages / messages, which would otherwise fail or stall the next request
+_SOCKET_OPTIONS = [*HTTPConnection.default_socket_options, (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+if hasattr(socket, "TCP_KEEPIDLE"):
+    _SOCKET_OPTIONS.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 30))
+if hasattr(socket, "TCP_KEEPINTVL"):
+    _SOCKET_OPTIONS.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 10))
+
+
+def _create_ssl_context(
+    cert: Optional[Union[Tuple[str], Tuple[str, str], Tuple[str, str, str]]],
+    verify: Optional[Union[str, bool]],
+    check_hostname: Optional[bool],
+    hostname_checks_common_name: Optional[bool],
+) -> ssl.SSLContext:
+    context = cast(ssl.SSLContext, create_urllib3_context())
+
+    context.minimum_version = ssl.TLSVersion.TLSv1_2
+
+    if cert and isinstance(cert, (tuple, list)):
+        context.load_cert_chain(*cert)
+
+    if verify:
+        if isinstance(verify, (str, bytes)):
+            context.load_verify_locations(verify)
+
+        if check_hostname is not None:
+            context.check_hostname = cast(bool, check_hostname)
+
+        context.verify_mode = ssl.CERT_REQUIRED
+        if context.check_hostname is not False and hostname_checks_common_name is not None:
+            context.hostname_checks_common_name = hostname_checks_common_name
+
+    if verify is False:
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+
+    return context
+
+
+def _file_versions(*paths) -> Tuple[Optional[Tuple[int, int]], ...]:
+    """(mtime, size) of each file path, so a cached context is rebuilt when a cert or CA file is replaced"""
+    versions: List[Optional[Tuple[int, int]]] = []
+    for path in paths:
+        if not isinstance(path, (str, bytes)):
+            continue
+        try:
+            file_stat = os.stat(path)
+        except OSError:
+            versions.append(None)
+            continue
+        versions.append((file_stat.st_mtime_ns, file_stat.st_size))
+    return tuple(versions)
+
+
+@functools.lru_cache(maxsize=16)
+def _shared_ssl_context(
+    cert: Optional[Tuple[str, ...]],
+    verify: Optional[Union[str, bool]],
+    check_hostname: Optional[bool],
+    hostname_checks_common_name: Optional[bool],
+    file_versions: Tuple[Optional[Tuple[int, int]], ...],
+) -> ssl.SSLContext:
+    """loading a CA bundle can take tens of ms, clients created with the same settings share a context"""
+    return _create_ssl_context(
+        cast(Optional[Union[Tuple[str], Tuple[str, str], Tuple[str, str, str]]], cert),
+        verify,
+        check_hostname,
+        hostname_checks_common_name,
+    )
+
+
 class SSLContextAdapter(HTTPAdapter):
     def __init__(
         self,
@@ -250,49 +446,52 @@ class SSLContextAdapter(HTTPAdapter):
         check_hostname: Optional[bool] = None,
         hostname_checks_common_name: Optional[bool] = None,
         max_retries: Union[int, Retry] = 0,
+        pool_connections: int = DEFAULT_POOLSIZE,
+        pool_maxsize: int = DEFAULT_POOLSIZE,
     ):
         self.cert = cert
         self.verify = verify
         self.check_hostname = check_hostname
         self.hostname_checks_common_name = hostname_checks_common_name
+        self._ssl_context: Optional[ssl.SSLContext] = None
 
-        super().__init__(max_retries=max_retries)
-
-    def create_ssl_context(self) -> ssl.SSLContext:
-        context = cast(ssl.SSLContext, create_urllib3_context())
-
-        context.minimum_version = ssl.TLSVersion.TLSv1_2
-
-        if self.cert and isinstance(self.cert, (tuple, list)):
-            context.load_cert_chain(*self.cert)
+        super().__init__(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=max_retries)
 
-        if self.verify:
-            if isinstance(self.verify, (str, bytes)):
-                context.load_verify_locations(self.verify)
-
-            if self.check_hostname is not None:
-                context.check_hostname = cast(bool, self.check_hostname)
-
-            context.verify_mode = ssl.CERT_REQUIRED
-            if context.check_hostname is not False and self.hostname_checks_common_name is not None:
-                context.hostname_checks_common_name = self.hostname_checks_common_name
-
-        if self.verify is False:
-            context.check_hostname = False
-            context.verify_mode = ssl.CERT_NONE
+    def _get_ssl_context(self) -> ssl.SSLContext:
+        """
+        the pool manager and any proxy managers share one context, as do other clients with the same settings,
+        so the cert chain and CA are only loaded once
+        """
+        if self._ssl_context is None:
+            cert = tuple(self.cert) if isinstance(self.cert, (tuple, list)) else None
+            # a (certfile, keyfile, password) cert is not shared, so the key password is not kept in the cache
+            if type(self).create_ssl_context is SSLContextAdapter.create_ssl_context and len(cert or ()) <= 2:
+                self._ssl_context = _shared_ssl_context(
+                    cert,
+                    self.verify,
+                    self.check_hostname,
+                    self.hostname_checks_common_name,
+                    _file_versions(*(cert or ())[:2], self.verify),
+                )
+            else:
+                self._ssl_context = self.create_ssl_context()
+        return self._ssl_context
 
-        return context
+    def create_ssl_context(self) -> ssl.SSLContext:
+        return _create_ssl_context(self.cert, self.verify, self.check_hostname, self.hostname_checks_common_name)
 
     def init_poolmanager(self, *args, **kwargs):
-        context = self.create_ssl_context()
+        context = self._get_ssl_context()
         kwargs["ssl_context"] = context
+        kwargs.setdefault("socket_options", _SOCKET_OPTIONS)
         if context.check_hostname is False:
             kwargs["assert_hostname"] = False
         return super().init_poolmanager(*args, **kwargs)
 
     def proxy_manager_for(self, proxy, **proxy_kwargs):
-        context = self.create_ssl_context()
+        context = self._get_ssl_context()
         proxy_kwargs["ssl_context"] = context
+        proxy_kwargs.setdefault("socket_options", _SOCKET_OPTIONS)
         if context.check_hostname is False:
             proxy_kwargs["assert_hostname"] = False
 
@@ -325,6 +524,8 @@ class MeshClient:
         retry_methods: Tuple[str, ...] = ("HEAD", "GET", "PUT", "POST", "DELETE", "OPTIONS", "TRACE"),
         timeout: Union[int, float] = 10 * 60,
         application_name: Optional[str] = None,
+        max_parallel_chunks: int = 1,
+        parallel_decompress: bool = False,
     ):
         """
         Create a new MeshClient.
@@ -351,6 +552,20 @@ class MeshClient:
         You can also optionally specify the maximum file size before chunking,
         and whether messages should be compressed, transparently, before
         sending.
+
+        For multi-chunk messages, max_parallel_chunks controls how many of the
+        chunks after the first are uploaded concurrently. Each in-flight chunk
+        is held in memory, so peak memory is roughly max_parallel_chunks * max_chunk_size.
+        The connection pool is sized to at least max_parallel_chunks so that
+        concurrent requests reuse kept-alive connections rather than opening
+        (and handshaking) new ones. When receiving multi-chunk messages with
+        max_parallel_chunks > 1, the request for the next chunk is issued in the
+        background while the current chunk is being read.
+
+        If parallel_decompress is set, chunks 2..N of gzip encoded multi-chunk
+        messages are downloaded and decompressed in the background, up to
+        max(2, max_parallel_chunks) at a time, while the caller reads earlier chunks.
+        Decompressed chunks are held in memory until read.
         """
         if isinstance(shared_key, str):
             shared_key = shared_key.encode(encoding="utf-8")
@@ -358,9 +573,13 @@ class MeshClient:
 
         self._mailbox = mailbox
         self._max_chunk_size = max_chunk_size
+        self._max_parallel_chunks = max(1, int(max_parallel_chunks))
+        self._parallel_decompress = parallel_decompress
         self._transparent_compress = transparent_compress
         self._timeout = timeout
         self._close_called = False
+        # per thread, the message ids acknowledged inside a batched_acks block, sent when the block exits
+        self._ack_batches = threading.local()
 
         self._session = requests.Session()
         application_name = (application_name or "").strip()
@@ -388,6 +607,12 @@ class MeshClient:
         if verify is False:
             self._session.verify = False
 
+        # every request is made relative to the mailbox, so only quote and join it once
+        self._mailbox_path = f"/messageexchange/{q(self._mailbox)}"
+        self._mailbox_url = f"{self._url}{self._mailbox_path}"
+        self._inbox_url = f"{self._mailbox_url}/inbox"
+        self._outbox_url = f"{self._mailbox_url}/outbox"
+
         url_lower = self._url.lower()
 
         self._retries: Union[int, Retry] = 0
@@ -401,13 +626,22 @@ class MeshClient:
                 allowed_methods=retry_methods,
             )
 
+        pool_maxsize = max(DEFAULT_POOLSIZE, self._max_parallel_chunks)
+
         if url_lower.startswith("https://"):
             self._session.mount(
                 self._url,
-                SSLContextAdapter(cert, verify, check_hostname, hostname_checks_common_name, max_retries=self._retries),
+                SSLContextAdapter(
+                    cert,
+                    verify,
+                    check_hostname,
+                    hostname_checks_common_name,
+                    max_retries=self._retries,
+                    pool_maxsize=pool_maxsize,
+                ),
             )
         else:
-            self._session.mount(self._url, HTTPAdapter(max_retries=self._retries))
+            self._session.mount(self._url, HTTPAdapter(max_retries=self._retries, pool_maxsize=pool_maxsize))
 
         if ".ncrs.nhs.uk" in url_lower:
             warnings.warn(
@@ -416,14 +650,18 @@ class MeshClient:
                 stacklevel=2,
             )
 
-        self._session.headers = {
-            "Accept": "application/vnd.mesh.v2+json",
-            "User-Agent": (
-                f"{self._client_name};{__version__};N/A;{platform.processor() or platform.machine()};"
-                f"{platform.system()};{platform.release()} {platform.version()}"
-            ),
-            "Accept-Encoding": "gzip",
-        }
+        os_architecture, os_name, os_version = _platform_details()
+        # update rather than replace, so the session headers stay a case insensitive dict
+        self._session.headers.update(
+            {
+                "Accept": "application/vnd.mesh.v2+json",
+                "User-Agent": (
+                    f"{self._client_name};{_get_version('mesh-client')};N/A;{os_architecture};{os_name};{os_version}"
+                ),
+                "Accept-Encoding": "gzip",
+                "Connection": "keep-alive",
+            }
+        )
 
         self._session.auth = AuthTokenGenerator(shared_key, mailbox, password)
 
@@ -431,11 +669,11 @@ class MeshClient:
 
     @property
     def mailbox_path(self) -> str:
-        return f"/messageexchange/{q(self._mailbox)}"
+        return self._mailbox_path
 
     @property
     def mailbox_url(self) -> str:
-        return f"{self._url}{self.mailbox_path}"
+        return self._mailbox_url
 
     def ping(self) -> dict:
         """
@@ -445,21 +683,22 @@ class MeshClient:
 
         response.raise_for_status()
 
-        return cast(dict, response.json())
+        return cast(dict, _response_json(response))
 
     def handshake(self):
         """
         connect and test authentication
         https://digital.nhs.uk/developer/api-catalogue/message-exchange-for-social-care-and-health-api#post-/messageexchange/-mailbox_id-
         """
+        os_architecture, os_name, os_version = _platform_details()
         headers = {
-            "mex-ClientVersion": f"{self._client_name}=={__version__}",
-            "mex-OSArchitecture": platform.processor() or platform.machine(),
-            "mex-OSName": platform.system(),
-            "mex-OSVersion": f"{platform.release()} {platform.version()}",
+            "mex-ClientVersion": f"{self._client_name}=={_get_version('mesh-client')}",
+            "mex-OSArchitecture": os_architecture,
+            "mex-OSName": os_name,
+            "mex-OSVersion": os_version,
             "mex-JavaVersion": "N/A",
         }
-        response = self._session.post(self.mailbox_url, headers=headers, timeout=self._timeout)
+        response = self._session.post(self._mailbox_url, headers=headers, timeout=self._timeout)
 
         response.raise_for_status()
 
@@ -471,9 +710,9 @@ class MeshClient:
         Count all messages in user's inbox. Returns an integer
         https://digital.nhs.uk/developer/api-catalogue/message-exchange-for-social-care-and-health-api#get-/messageexchange/-mailbox_id-/count
         """
-        response = self._session.get(f"{self.mailbox_url}/count", timeout=self._timeout)
+        response = self._session.get(f"{self._mailbox_url}/count", timeout=self._timeout)
         response.raise_for_status()
-        return cast(int, response.json()["count"])
+        return cast(int, _response_json(response)["count"])
 
     def track_message(self, message_id: str) -> TrackingResponse_v2:
         """
@@ -481,11 +720,11 @@ class MeshClient:
         Returns a dictionary, in much the same format that MESH provides it.
         https://digital.nhs.uk/developer/api-catalogue/message-exchange-for-social-care-and-health-api#get-/messageexchange/-mailbox_id-/outbox/tracking
         """
-        url = f"{self.mailbox_url}/outbox/tracking?messageID={q(message_id)}"
+        url = f"{self._outbox_url}/tracking?messageID={q(message_id)}"
 
         response = self._session.get(url, timeout=self._timeout)
         response.raise_for_status()
-        return cast(TrackingResponse_v2, response.json())
+        return cast(TrackingResponse_v2, _response_json(response))
 
     def lookup_endpoint(self, ods_code: str, workflow_id: str) -> EndpointLookupResponse_v2:
         """
@@ -498,16 +737,16 @@ class MeshClient:
             timeout=self._timeout,
         )
         response.raise_for_status()
-        return cast(EndpointLookupResponse_v2, response.json())
+        return cast(EndpointLookupResponse_v2, _response_json(response))
 
     def _inbox_v2_page(
         self, url: Optional[str] = None, params: Optional[Dict[str, Any]] = None
     ) -> ListMessageResponse_v2:
-        url = url or f"{self.mailbox_url}/inbox"
+        url = url or self._inbox_url
         response = self._session.get(url, timeout=self._timeout, params=params)
         response.raise_for_status()
 
-        return cast(ListMessageResponse_v2, response.json())
+        return cast(ListMessageResponse_v2, _response_json(response))
 
     def list_messages(self, max_results: Optional[int] = None, workflow_filter: Optional[str] = None) -> List[str]:
         """
@@ -558,9 +797,7 @@ class MeshClient:
         """
         chunk_num = int(chunk_num)
         uri = (
-            f"{self.mailbox_url}/inbox/{q(message_id)}/{chunk_num}"
-            if chunk_num > 1
-            else f"{self.mailbox_url}/inbox/{q(message_id)}"
+            f"{self._inbox_url}/{q(message_id)}/{chunk_num}" if chunk_num > 1 else f"{self._inbox_url}/{q(message_id)}"
         )
 
         response = self._session.get(
@@ -596,13 +833,11 @@ class MeshClient:
         }
 
         for key, value in kwargs.items():
-            if key in _SEND_HEADERS:
-                if key in _BOOLEAN_HEADERS:
-                    value = "Y" if value else "N"
-                headers[_SEND_HEADERS[key]] = str(value)
-            else:
-                optional_args = ", ".join(["recipient", "data", *list(_OPTIONAL_HEADERS.keys())])
-                raise TypeError(f"Unrecognised keyword argument '{key}'.  optional arguments are: {optional_args}")
+            header_formatter = _SEND_HEADER_FORMATTERS.get(key)
+            if header_formatter is None:
+                raise TypeError(f"Unrecognised keyword argument '{key}'.  optional arguments are: {_SEND_ARGS_HELP}")
+            header, formatter = header_formatter
+            headers[header] = formatter(value)
 
         if headers["Content-Type"] == headers.get("Mex-Content-Type"):
             # don't send both if they're the same
@@ -641,9 +876,14 @@ class MeshClient:
         chunk_num = int(chunk_num)
         compress = self._transparent_compress if compress is None else compress
 
-        def maybe_compressed(maybe_compress: bytes):
+        def maybe_compressed(maybe_compress):
             if not compress:
                 return maybe_compress
+            if isinstance(maybe_compress, bytes):
+                maybe_compress = BytesIO(maybe_compress)
+            if chunk_num > 1 and self._retries and _is_seekable(maybe_compress):
+                # compressed again if the chunk is retried, rather than buffering the compressed chunk below
+                return RewindableGzipCompressStream(maybe_compress)
             return GzipCompressStream(maybe_compress)
 
         headers = self._headers_for_chunk(
@@ -653,7 +893,7 @@ class MeshClient:
         data = maybe_compressed(chunk)
 
         buffer = data
-        if chunk_num > 1 and self._retries:
+        if chunk_num > 1 and self._retries and not _is_seekable(data):
             # urllib3 body_pos requires a seekable stream to allow rewinding on retry ( we never retry the first chunk )
             buffer = BytesIO(data.read() if hasattr(data, "read") else data)
 
@@ -661,7 +901,7 @@ class MeshClient:
             assert not message_id, "message_id should not be sent with the first chunk"
 
             response = self._session.post(
-                f"{self.mailbox_url}/outbox",
+                self._outbox_url,
                 data=buffer,
                 headers=headers,
                 timeout=self._timeout,
@@ -675,7 +915,7 @@ class MeshClient:
         assert message_id, "message_id is required for chunks number >= 2"
 
         response = self._session.post(
-            f"{self.mailbox_url}/outbox/{q(message_id)}/{chunk_num}",
+            f"{self._outbox_url}/{q(message_id)}/{chunk_num}",
             data=buffer,
             headers=headers,
             timeout=self._timeout,
@@ -732,18 +972,33 @@ class MeshClient:
         compress = self._transparent_compress if compress is None else compress
 
         max_chunk_size = max_chunk_size or self._max_chunk_size
-        chunks = SplitStream(data, max_chunk_size)
-
-        chunk_iterator = iter(chunks)
-
-        first_chunk = next(chunk_iterator)
-        total_chunks = len(chunks)
+        if isinstance(data, bytes) and len(data) <= max_chunk_size:
+            # most messages fit in a single chunk, post the bytes as they are
+            first_chunk, total_chunks = data, 1
+            chunk_iterator: Iterator = iter(())
+            independent_chunks = True
+        else:
+            try:
+                chunks = SplitStream(data, max_chunk_size)
+            except TypeError:
+                if not hasattr(data, "read"):
+                    raise
+                spooled = _spool_unsized(data, max_chunk_size)
+                try:
+                    return self.send_message(recipient, spooled, max_chunk_size, compress, **kwargs)
+                finally:
+                    if hasattr(spooled, "close"):
+                        spooled.close()
+            chunk_iterator = iter(chunks)
+            first_chunk = next(chunk_iterator)
+            total_chunks = len(chunks)
+            independent_chunks = chunks.independent_chunks
 
         response1 = self.send_chunk(
             recipient=recipient, chunk=first_chunk, chunk_num=1, total_chunks=total_chunks, compress=compress, **kwargs
         )
 
-        response_dict = response1.json()
+        response_dict = _response_json(response1)
         if _looks_like_send_error(response1.status_code, response_dict):
             msg, error_response = _get_send_error_message(response_dict)
             raise MeshError(msg, error_response)
@@ -755,6 +1010,18 @@ class MeshClient:
 
         message_id = success_response["message_id"]
 
+        if self._max_parallel_chunks > 1 and total_chunks > 2:
+            self._send_chunks_concurrently(
+                recipient=recipient,
+                chunk_iterator=chunk_iterator,
+                message_id=message_id,
+                total_chunks=total_chunks,
+                compress=compress,
+                independent_chunks=independent_chunks,
+                **kwargs,
+            )
+            return message_id
+
         for chunk_num, chunk in enumerate(chunk_iterator, start=2):
             _response = self.send_chunk(
                 recipient=recipient,
@@ -768,6 +1035,63 @@ class MeshClient:
 
         return message_id
 
+    def _send_chunks_concurrently(
+        self,
+        recipient: str,
+        chunk_iterator: Iterator,
+        message_id: str,
+        total_chunks: int,
+        compress: bool,
+        independent_chunks: bool,
+        **kwargs,
+    ):
+        """
+        upload chunks 2..N with up to max_parallel_chunks requests in flight; chunks of in-memory data are
+        independent views and are streamed as is, chunks of a stream can only be read sequentially, so are read
+        into memory before being handed to a worker
+        """
+        from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+        chunk_nums: Dict[Future, int] = {}
+
+        def check_done(done: Set[Future], pending: Set[Future]):
+            failed = [chunk_nums[future] for future in done if future.exception() is not None]
+            if not failed:
+                return
+            # surface failures in chunk order, as the sequential upload would, so let earlier chunks finish first
+            earlier = {future for future in pending if chunk_nums[future] < min(failed)}
+            wait(earlier)
+            for future in sorted(done | earlier, key=chunk_nums.__getitem__):
+                future.result()
+
+        pending: Set[Future] = set()
+        with ThreadPoolExecutor(max_workers=self._max_parallel_chunks, thread_name_prefix="mesh_client") as executor:
+            try:
+                for chunk_num, chunk in enumerate(chunk_iterator, start=2):
+                    if len(pending) >= self._max_parallel_chunks:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        check_done(done, pending)
+
+                    future = executor.submit(
+                        self.send_chunk,
+                        recipient=recipient,
+                        chunk=chunk if independent_chunks else BytesIO(chunk.read()),
+                        chunk_num=chunk_num,
+                        message_id=message_id,
+                        total_chunks=total_chunks,
+                        compress=compress,
+                        **kwargs,
+                    )
+                    chunk_nums[future] = chunk_num
+                    pending.add(future)
+
+                done, pending = wait(pending)
+                check_done(done, pending)
+            except BaseException:
+                for future in pending:
+                    future.cancel()
+                raise
+
     def acknowledge_message(self, message_id: str):
         """
         Acknowledge a message_id, deleting it from MESH.
@@ -775,13 +1099,76 @@ class MeshClient:
         """
         message_id = getattr(message_id, "_msg_id", message_id)
         response = self._session.put(
-            f"{self.mailbox_url}/inbox/{q(message_id)}/status/acknowledged",
+            f"{self._inbox_url}/{q(message_id)}/status/acknowledged",
             timeout=self._timeout,
         )
         response.raise_for_status()
 
+    def acknowledge_messages(self, message_ids: Iterable[str], max_workers: int = 8):
+        """
+        Acknowledge several message_ids, deleting them from MESH, with up to max_workers
+        requests in flight at a time rather than one round trip after another.
+        All acknowledgements are attempted, the first failure (if any) is then raised.
+        """
+        message_ids = list(message_ids)
+        if len(message_ids) < 2 or max_workers < 2:
+            for message_id in message_ids:
+                self.acknowledge_message(message_id)
+            return
+
+        # concurrent.futures is only imported when threads are used, most clients never need it
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mesh_client") as executor:
+            futures = [executor.submit(self.acknowledge_message, message_id) for message_id in message_ids]
+        for future in futures:
+            future.result()
+
+    @contextlib.contextmanager
+    def batched_acks(self, max_workers: int = 8) -> Generator[None, None, None]:
+        """
+        Within this block, Message.acknowledge (and so leaving a message's with block) only
+        queues the message id; the queued ids are acknowledged concurrently, see acknowledge_messages,
+        when the block exits, including when it exits with an exception (which is still the error raised,
+        with any acknowledgement failure as its cause).
+        Only messages acknowledged by the thread that entered the block are queued, other threads
+        using the same client still acknowledge immediately.
+
+            with client.batched_acks():
+                for message in client.iterate_all_messages():
+                    with message:
+                        process(message)
+        """
+        if self._pending_acks() is not None:
+            # already batching, the outer block will send them
+            yield
+            return
+
+        pending: List[str] = []
+        self._ack_batches.pending = pending
+        try:
+            yield
+        except BaseException as error:
+            self._ack_batches.pending = None
+            try:
+                self.acknowledge_messages(pending, max_workers=max_workers)
+            except Exception as ack_error:
+                # don't let a failed acknowledgement hide the error that ended the block
+                raise error from ack_error
+            raise
+
+        self._ack_batches.pending = None
+        self.acknowledge_messages(pending, max_workers=max_workers)
+
+    def _pending_acks(self) -> Optional[List[str]]:
+        """the ids queued by the current thread's batched_acks block, None if not batching"""
+        return cast(Optional[List[str]], getattr(self._ack_batches, "pending", None))
+
     def iterate_message_ids(
-        self, workflow_filter: Optional[str] = None, batch_size: Optional[int] = None
+        self,
+        workflow_filter: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        prefetch_next_page: bool = False,
     ) -> Generator[str, None, None]:
         """
             generator lists messages ids in the inbox;
@@ -790,6 +1177,8 @@ class MeshClient:
             batch_size (Optional[int]): optional max results to limit the page size this will not limit the
             TOTAL results of the generator ... just limit the page size
             workflow_filter (Optional[str]): workflow filter string
+            prefetch_next_page (bool): request the next page in the background while the ids from the current
+            page are consumed
 
         Returns:
             Generator[str]: message ids
@@ -811,13 +1200,26 @@ class MeshClient:
 
         result = self._inbox_v2_page(params=params)
         next_page, messages = _next_messages(result)
+
+        if prefetch_next_page and next_page:
+            # concurrent.futures is only imported when threads are used, most clients never need it
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(max_workers=1, thread_name_prefix="mesh_client") as executor:
+                while next_page:
+                    next_result = executor.submit(self._inbox_v2_page, f"{self._url}{next_page}")
+                    yield from messages
+                    next_page, messages = _next_messages(next_result.result())
+
         yield from messages
         while next_page:
             result = self._inbox_v2_page(f"{self._url}{next_page}")
             next_page, messages = _next_messages(result)
             yield from messages
 
-    def iterate_messages(self, workflow_filter: Optional[str] = None, batch_size: Optional[int] = None):
+    def iterate_messages(
+        self, workflow_filter: Optional[str] = None, batch_size: Optional[int] = None, prefetch: int = 0
+    ):
         """
             generator lists messages ids in the inbox;
             Iterate over a list of Message objects for all messages in the user's
@@ -828,15 +1230,21 @@ class MeshClient:
         Args:
             batch_size (Optional[int]): optional max results to limit the page size
             workflow_filter (Optional[str]): workflow filter string
+            prefetch (int): optional number of messages to retrieve in the background, ahead of the one being consumed;
+            when set the next page of message ids is also requested in the background
 
         Returns:
             Generator[Message]: messages in inbox
         """
 
-        for msg_id in self.iterate_message_ids(workflow_filter=workflow_filter, batch_size=batch_size):
-            yield self.retrieve_message(msg_id)
+        yield from self._retrieve_messages(
+            self.iterate_message_ids(
+                workflow_filter=workflow_filter, batch_size=batch_size, prefetch_next_page=prefetch > 0
+            ),
+            prefetch,
+        )
 
-    def iterate_all_messages(self):
+    def iterate_all_messages(self, prefetch: int = 0):
         """
             generator lists messages ids in the inbox;
             Iterate over a list of Message objects for all messages in the user's
@@ -845,14 +1253,24 @@ class MeshClient:
             will also begin to download messages.
 
         Args:
-            page_size (Optional[int]): optional max results to limit the page size, will not limit the tota
+            prefetch (int): optional number of messages to retrieve in the background, ahead of the one being consumed;
+            when set the next page of message ids is also requested in the background
 
         Returns:
             Generator[Message]: messages in inbox
         """
 
-        for msg_id in self.iterate_message_ids():
-            yield self.retrieve_message(msg_id)
+        yield from self._retrieve_messages(self.iterate_message_ids(prefetch_next_page=prefetch > 0), prefetch)
+
+    def _retrieve_messages(self, message_ids: Iterable[str], prefetch: int) -> Generator["Message", None, None]:
+        if prefetch < 1:
+            for msg_id in message_ids:
+                yield self.retrieve_message(msg_id)
+            return
+
+        yield from _prefetch(
+            (functools.partial(self.retrieve_message, msg_id) for msg_id in message_ids), window=prefetch + 1
+        )
 
     def close(self):
         self._close_called = True
@@ -904,6 +1322,74 @@ class _MessageAttrs:
 TDefault = TypeVar("TDefault")
 
 
+def _response_json(response: Response) -> Any:
+    """response.json(), but parsed with orjson when it is installed"""
+    encoding = response.encoding if "charset" in response.headers.get("Content-Type", "").lower() else None
+    try:
+        if encoding and encoding.lower().replace("-", "").replace("_", "") != "utf8":
+            # the server declared some other charset, let requests decode the text
+            return _json_loads(response.text)
+        return _json_loads(response.content)
+    except ValueError as e:
+        # keep raising the same error type as response.json()
+        raise _JSONDecodeError(getattr(e, "msg", str(e)), getattr(e, "doc", response.text), getattr(e, "pos", 0)) from e
+
+
+def _chunk_count(chunk_range: Optional[str]) -> int:
+    """total chunks from a Mex-Chunk-Range header value e.g. '1:3', most messages are a single chunk"""
+    if not chunk_range or chunk_range == "1:1":
+        return 1
+    return int(chunk_range.partition(":")[2])
+
+
+def _is_seekable(data) -> bool:
+    """bytes can be resent as is, streams only if they can be rewound"""
+    if isinstance(data, bytes):
+        return True
+    seekable = getattr(data, "seekable", None)
+    return bool(seekable and seekable())
+
+
+# urllib3 2.x buffers decoded data so read(amt) returns amt bytes until eof, 1.x can return b"" mid stream
+_URLLIB3_DECODES_READS = int(urllib3.__version__.split(".")[0]) >= 2
+
+
+def _spool_unsized(data, max_chunk_size: int):
+    """
+    the chunk count is sent with the first chunk, so a stream of unknown size (e.g. a pipe) is read just far
+    enough to tell whether it fits in a single chunk, and otherwise spooled to a temporary file to be chunked
+    """
+    head: List[bytes] = []
+    head_size = 0
+    while head_size <= max_chunk_size:
+        block = data.read(max_chunk_size + 1 - head_size)
+        if not block:
+            return b"".join(head)
+        head.append(block)
+        head_size += len(block)
+
+    spooled = tempfile.TemporaryFile()  # noqa: SIM115 - returned to, and closed by, send_message
+    try:
+        spooled.writelines(head)
+        del head
+        shutil.copyfileobj(data, spooled)
+        spooled.seek(0)
+    except BaseException:
+        spooled.close()
+        raise
+    return spooled
+
+
+def _maybe_decompress(response: Response):
+    if response.headers.get("Content-Encoding") == "gzip":
+        if _URLLIB3_DECODES_READS:
+            # let urllib3 decode in its own read loop, rather than another python stream wrapper
+            response.raw.decode_content = True
+            return response.raw
+        return GzipDecompressStream(response.raw)
+    return response.raw
+
+
 class _BaseMessage:
     """
     An object representing a message received from MESH. This is a file-like
@@ -943,37 +1429,66 @@ class _BaseMessage:
     def __init__(self, msg_id: str, response, client):
         self._msg_id = msg_id
         self._client = client
-        self._mex_headers: Dict[str, Any] = {}
 
         headers = response.headers
 
-        for header, header_value in headers.items():
-            lkey = header.lower()
-            if lkey.startswith("mex-"):
-                self._mex_headers[lkey[4:]] = header_value
-
-        for attribute, header in _RECEIVE_HEADERS.items():
-            header_value = headers.get(header, None)
-            if attribute in _BOOLEAN_HEADERS:
-                header_value = header_value or "N"
-                header_value = header_value.upper() in ["Y", "TRUE"]
+        # the case insensitive dict already holds the lowercased keys, so there is no need to lower each header
+        mex_headers: Dict[str, Any] = {
+            lkey[4:]: header_value for lkey, header_value in headers.lower_items() if lkey[:4] == "mex-"
+        }
+        self._mex_headers = mex_headers
 
-            setattr(self, attribute, header_value)
-        chunk, chunk_count = map(int, headers.get("Mex-Chunk-Range", "1:1").split(":"))
+        # the mex headers are already collected above, so avoid a case-insensitive lookup per attribute
+        for attribute, key in _RECEIVE_VALUE_KEYS:
+            setattr(self, attribute, mex_headers.get(key))
+        for attribute, key in _RECEIVE_BOOLEAN_KEYS:
+            setattr(self, attribute, (mex_headers.get(key) or "N").upper() in _TRUE_VALUES)
+        chunk_count = _chunk_count(mex_headers.get("chunk-range"))
 
         if not hasattr(self, "content_type") or not self.content_type:  # type: ignore[has-type]
             # try and get content_type from Mex-Content-Type first, but fallback to request content type if not set
             setattr(self, "content_type", headers.get("Content-Type"))  # noqa: B010
 
-        def maybe_decompress(resp):
-            return GzipDecompressStream(resp.raw) if resp.headers.get("Content-Encoding") == "gzip" else resp.raw
+        self._stream = CombineStreams(self._chunk_streams(response, chunk_count))
 
-        self._stream = CombineStreams(
-            chain(
-                [maybe_decompress(response)],
-                (maybe_decompress(client.retrieve_message_chunk(msg_id, i + 2)) for i in range(chunk_count - 1)),
+    def _chunk_streams(self, response: Response, chunk_count: int) -> Generator[Any, None, None]:
+        """
+        yields a readable per chunk; a generator rather than chain() so that closing the message
+        also closes any background prefetch
+        """
+        yield _maybe_decompress(response)
+        if chunk_count < 2:
+            return
+
+        client = self._client
+        chunk_nums = range(2, chunk_count + 1)
+
+        if client._parallel_decompress and response.headers.get("Content-Encoding") == "gzip":
+            # each chunk is an independent gzip stream, so they can be decompressed concurrently
+            yield from _prefetch(
+                (functools.partial(self._fetch_decompressed, chunk_num) for chunk_num in chunk_nums),
+                window=max(2, client._max_parallel_chunks),
             )
-        )
+            return
+
+        if client._max_parallel_chunks > 1:
+            # request the next chunk in the background while the current one is being read
+            for chunk_response in _prefetch(
+                (functools.partial(client.retrieve_message_chunk, self._msg_id, chunk_num) for chunk_num in chunk_nums),
+                window=2,
+            ):
+                yield _maybe_decompress(chunk_response)
+            return
+
+        for chunk_num in chunk_nums:
+            yield _maybe_decompress(client.retrieve_message_chunk(self._msg_id, chunk_num))
+
+    def _fetch_decompressed(self, chunk_num: int) -> BytesIO:
+        chunk_response = self._client.retrieve_message_chunk(self._msg_id, chunk_num)
+        try:
+            return BytesIO(_maybe_decompress(chunk_response).read())
+        finally:
+            chunk_response.close()
 
     def id(self) -> str:
         """return the message id
@@ -990,6 +1505,13 @@ class _BaseMessage:
         """
         return self._stream.read(n)
 
+    def readinto(self, b) -> int:
+        """
+        Read into the pre-allocated, writable bytes-like object b, returning the
+        number of bytes read, which is only less than len(b) at the end of the message.
+        """
+        return self._stream.readinto(b)
+
     def readline(self) -> bytes:
         """
         Read a single line from the message
@@ -1014,6 +1536,11 @@ class _BaseMessage:
         """
         Acknowledge this message, and delete it from MESH
         """
+        pending_acks = self._client._pending_acks()
+        if pending_acks is not None:
+            # inside client.batched_acks(), acknowledged when the block exits
+            pending_acks.append(self._msg_id)
+            return
         self._client.acknowledge_message(self._msg_id)
 
     def mex_header(self, key: str, default: Optional[TDefault] = None) -> Union[str, TDefault]:
@@ -1028,7 +1555,7 @@ class _BaseMessage:
         return self._mex_headers.get(key, default)
 
     def mex_headers(self):
-        """returns a generator iteritems for all the headers"""
+        """returns an items view of all the mex headers"""
         return self._mex_headers.items()
 
     def __enter__(self):
@@ -1059,7 +1586,15 @@ class AuthTokenGenerator:
         self._mailbox = mailbox
         self._password = password
         self._nonce = uuid.uuid4()
-        self._nonce_count = 0
+        # next() on a count is atomic, so concurrent chunk uploads sharing the session never reuse a nonce count
+        self._nonce_count = itertools.count()
+        # mailbox and nonce are the same for every token, so format them once
+        self._auth_prefix = f"{mailbox}:{self._nonce}:"
+        # keyed and fed the fixed prefix once, copied per token, saves re-deriving the inner/outer pads
+        # and re-hashing the prefix on every request; this is also about twice as fast as the one-shot
+        # hmac.digest(), which has to key a new OpenSSL HMAC context each time
+        self._hmac = hmac.new(key, self._auth_prefix.encode("ASCII"), digestmod=sha256)
+        self._timestamp_cache: Tuple[int, str] = (-1, "")
 
     def __call__(self, r=None):
         token = self.generate_token()
@@ -1071,13 +1606,23 @@ class AuthTokenGenerator:
             # This is being used in its legacy capacity
             return token
 
+    def _timestamp(self) -> str:
+        """the token timestamp only has minute resolution, so only format it when the minute changes"""
+        minute = int(time.time()) // 60
+        cached_minute, timestamp = self._timestamp_cache
+        if minute != cached_minute:
+            timestamp = time.strftime("%Y%m%d%H%M", time.gmtime(minute * 60))
+            self._timestamp_cache = (minute, timestamp)
+        return timestamp
+
     def generate_token(self) -> str:
-        now = datetime.datetime.utcnow().strftime("%Y%m%d%H%M")
-        public_auth_data = f"{self._mailbox}:{self._nonce}:{self._nonce_count}:{now}"
-        private_auth_data = f"{self._mailbox}:{self._nonce}:{self._nonce_count}:{self._password}:{now}"
-        myhash = hmac.HMAC(self._key, private_auth_data.encode("ASCII"), sha256).hexdigest()
-        self._nonce_count += 1
-        return f"NHSMESH {public_auth_data}:{myhash}"
+        now = self._timestamp()
+        nonce_count = next(self._nonce_count)
+        # the private auth data is "{mailbox}:{nonce}:{nonce_count}:{password}:{now}", the prefix is already hashed
+        hasher = self._hmac.copy()
+        hasher.update(f"{nonce_count}:{self._password}:{now}".encode("ASCII"))
+        myhash = hasher.hexdigest()
+        return f"NHSMESH {self._auth_prefix}{nonce_count}:{now}:{myhash}"
 
 
 # Preserve old name, even though it's part of the API now
@@ -1,9 +1,23 @@
 import contextlib
 import io
 import os
+import stat
 import warnings
 import zlib
-from typing import List, cast
+from typing import List, Optional, cast
+
+try:
+    # ISA-L accelerated deflate/inflate, a drop-in replacement for the zlib calls below when installed
+    from isal import isal_zlib as _zlib  # type: ignore[import]
+
+    _MAX_COMPRESS_LEVEL = _zlib.ISAL_BEST_COMPRESSION  # pragma: no cover
+except ImportError:
+    try:
+        # zlib-ng, also a drop-in replacement, supports all the zlib compression levels
+        from zlib_ng import zlib_ng as _zlib  # type: ignore[import,no-redef]
+    except ImportError:
+        _zlib = zlib  # type: ignore[misc]
+    _MAX_COMPRESS_LEVEL = _zlib.Z_BEST_COMPRESSION
 
 
 class IteratorMixin:
@@ -15,34 +29,43 @@ class IteratorMixin:
     __line_iterator = None
 
     def __iter__(self):
-        # We use a BytesIO as our buffer, so we can piggyback on its readlines method
-        buff = io.BytesIO()
+        # like a file, iterating carries on from (and shares buffered data with) readline
+        if self.__line_iterator is None:
+            self.__line_iterator = self.__iter_lines()
+        return self.__line_iterator
+
+    def __iter_lines(self):
+        # the partial line carried over from previous blocks, kept as parts so a long line is only joined once
+        partial: List[bytes] = []
         while True:
             block = self.read(self.__block_size)  # type: ignore[attr-defined]
-            buff.write(block)
-            last_block = len(block) == 0
-            buff.seek(0)
-            lines = buff.readlines()
-            yield from lines[:-1]
-            if not last_block:
-                buff.seek(0)
-                buff.write(lines[-1])
-                buff.truncate()
-            else:
-                yield lines[-1]
-                break
+            if not block:
+                if partial:
+                    yield b"".join(partial)
+                return
+            if b"\n" not in block:
+                partial.append(block)
+                continue
+            # split the whole block in one go with BytesIO.readlines, rather than a python loop per line
+            lines = io.BytesIO(block).readlines()
+            if partial:
+                partial.append(lines[0])
+                lines[0] = b"".join(partial)
+                partial = []
+            if not lines[-1].endswith(b"\n"):
+                partial.append(lines.pop())
+            yield from lines
 
     def readline(self) -> bytes:
-        if not self.__line_iterator:
-            self.__line_iterator = iter(self)
-        try:
-            return cast(bytes, next(self.__line_iterator))
-        except StopIteration:
-            return b""
+        return cast(bytes, next(iter(self), b""))
 
     def readlines(self) -> List[bytes]:
         return list(iter(self))
 
+    def _discard_lines(self):
+        """forget any lines buffered ahead of the read position, e.g. after a seek"""
+        self.__line_iterator = None
+
 
 class CloseUnderlyingMixin:
     def close(self):
@@ -79,42 +102,41 @@ class AbstractGzipStream(IteratorMixin, CloseUnderlyingMixin):
 
     def __init__(self, underlying, block_size=65536):
         self._underlying = underlying
-        self._buffer = io.BytesIO()
+        # bytearray drops consumed bytes from the front without copying the remainder
+        self._buffer = bytearray()
         self._block_size = block_size
 
     def _process_block(self, block):
         raise NotImplementedError
 
+    def _process_pending(self):
+        """output held back from previously processed blocks"""
+        return b""
+
     def _finish(self):
         raise NotImplementedError
 
     def read(self, n=-1):
-        if n == -1:
+        if n is not None and n < 0:
             n = None
-        while True:
-            # If underlying stream finished, just read from buffer
-            if self._underlying is None:
-                return self._buffer.read(n)
-
-            # If underlying stream not finished, buffer is positioned at end,
-            # ready for writing
-            limit = self._buffer.tell()
-            if n is not None and n != -1 and limit >= n:
-                self._buffer.seek(0)
-                try:
-                    return self._buffer.read(n)
-                finally:
-                    remainder = self._buffer.read(limit - n)
-                    self._buffer = io.BytesIO(remainder)
-                    self._buffer.seek(0, 2)
+        # keep processing blocks from the underlying stream until there is enough output buffered
+        while self._underlying is not None and (n is None or len(self._buffer) < n):
+            pending = self._process_pending()
+            if pending:
+                self._buffer += pending
+                continue
+            next_block = self._underlying.read(self._block_size)
+            if len(next_block) > 0:
+                self._buffer += self._process_block(next_block)
             else:
-                next_block = self._underlying.read(self._block_size)
-                if len(next_block) > 0:
-                    self._buffer.write(self._process_block(next_block))
-                else:
-                    self._buffer.write(self._finish())
-                    self._buffer.seek(0)
-                    self.close()
+                self._buffer += self._finish()
+                self.close()
+
+        if n is None:
+            n = len(self._buffer)
+        result = bytes(self._buffer[:n])
+        del self._buffer[:n]
+        return result
 
     def read_all(self):
         self.read()
@@ -124,19 +146,81 @@ class GzipCompressStream(AbstractGzipStream):
     """
     Wrap an existing readable, in a readable that produces a gzipped
     version of the underlying stream.
+
+    When isal is installed the compression level is capped at the isal maximum (3),
+    otherwise zlib-ng is used when installed, falling back to zlib.
+
+    If a hasher (e.g. hashlib.sha256()) is given it is updated with the uncompressed
+    data as it is read, so the checksum is complete once the stream is exhausted
+    without a second pass over the data.
     """
 
-    def __init__(self, underlying, block_size=65536):
+    def __init__(self, underlying, block_size=65536, compress_level=9, hasher=None):
         AbstractGzipStream.__init__(self, underlying, block_size)
-        self._compress_obj = zlib.compressobj(
-            9, zlib.DEFLATED, 31  # level  # method  # wbits - gzip header, maximum window
+        self._compress_obj = _zlib.compressobj(
+            min(compress_level, _MAX_COMPRESS_LEVEL),  # level
+            _zlib.DEFLATED,  # method
+            31,  # wbits - gzip header, maximum window
         )
+        self._hasher = hasher
 
     def _process_block(self, block):
+        if self._hasher is not None:
+            self._hasher.update(block)
         return self._compress_obj.compress(block)
 
     def _finish(self):
-        return self._compress_obj.flush(zlib.Z_FINISH)
+        return self._compress_obj.flush(_zlib.Z_FINISH)
+
+
+class _KeepOpen:
+    """pass reads through, but leave the underlying stream open when closed"""
+
+    def __init__(self, underlying):
+        self._underlying = underlying
+
+    def read(self, n=-1):
+        return self._underlying.read(n)
+
+
+class RewindableGzipCompressStream(IteratorMixin, CloseUnderlyingMixin):
+    """
+    A GzipCompressStream over a seekable readable, that can be rewound to where it started
+    (as urllib3 does to resend a request body on retry) by compressing the data again,
+    rather than holding all of the compressed output in memory in case it is needed twice.
+    """
+
+    def __init__(self, underlying, block_size=65536, compress_level=9):
+        self._underlying = underlying
+        self._start = underlying.tell()
+        self._block_size = block_size
+        self._compress_level = compress_level
+        self._position = 0
+        self._stream = GzipCompressStream(_KeepOpen(underlying), block_size, compress_level)
+
+    def read(self, n=-1):
+        data = self._stream.read(n)
+        self._position += len(data)
+        return data
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence != io.SEEK_SET or offset not in (0, self._position):
+            # the compressed length is not known up front, so only rewinding is supported
+            raise io.UnsupportedOperation("can only seek to the start of a compressed stream")
+        if offset == 0 and self._position:
+            if self._underlying is None:
+                raise ValueError("seek of closed stream")
+            self._underlying.seek(self._start)
+            self._stream = GzipCompressStream(_KeepOpen(self._underlying), self._block_size, self._compress_level)
+            self._position = 0
+            self._discard_lines()
+        return self._position
 
 
 class GzipDecompressStream(AbstractGzipStream):
@@ -147,41 +231,128 @@ class GzipDecompressStream(AbstractGzipStream):
 
     def __init__(self, underlying, block_size=65536):
         AbstractGzipStream.__init__(self, underlying, block_size)
-        self._decompress_obj = zlib.decompressobj(47)  # wbits - detect header, maximum window
+        self._decompress_obj = _zlib.decompressobj(47)  # wbits - detect header, maximum window
 
     def _process_block(self, block):
-        return self._decompress_obj.decompress(block)
+        # a small block of highly compressed input can inflate to many MiB, so cap the output per block and
+        # keep the rest of the input as the unconsumed tail, rather than buffering it all for a small read
+        return self._decompress_obj.decompress(self._decompress_obj.unconsumed_tail + block, self._block_size)
+
+    def _process_pending(self):
+        if not self._decompress_obj.unconsumed_tail:
+            return b""
+        return self._decompress_obj.decompress(self._decompress_obj.unconsumed_tail, self._block_size)
 
     def _finish(self):
         return self._decompress_obj.flush()
 
 
+class _BufferReader(IteratorMixin):
+    """
+    Read only, seekable, file-like view over a bytes-like object, reads copy only the bytes requested
+    """
+
+    def __init__(self, data):
+        self._view = memoryview(data).cast("B")
+        self._pos = 0
+
+    def __len__(self):
+        return len(self._view)
+
+    def read(self, n=-1) -> bytes:
+        end = len(self._view) if n is None or n < 0 else min(self._pos + n, len(self._view))
+        start = min(self._pos, end)
+        self._pos = max(self._pos, end)
+        return self._view[start:end].tobytes()
+
+    def seekable(self):
+        return True
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        if offset < 0:
+            raise ValueError(f"negative seek position {offset}")
+        self._pos = offset
+        self._discard_lines()
+        return self._pos
+
+    def tell(self):
+        return self._pos
+
+    def close(self):
+        self._view.release()
+
+
+def _regular_file_size(data) -> Optional[int]:
+    """
+    size of a file backed stream, None for in memory streams (which have a fileno method that raises)
+    and for pipes and sockets, which report a size of 0 whatever they will produce
+    """
+    if not hasattr(data, "fileno"):
+        return None
+    try:
+        file_stat = os.fstat(data.fileno())
+    except (OSError, ValueError):
+        return None
+    return file_stat.st_size if stat.S_ISREG(file_stat.st_mode) else None
+
+
 class SplitStream(CloseUnderlyingMixin):
+    """
+    Split a readable into chunks of at most chunk_size. Streams must be read one chunk at a time, in order;
+    in memory data is split into independent, seekable, zero-copy views which can be read in any order.
+    """
+
     def __init__(self, data, chunk_size=75 * 1024 * 1024):
-        if isinstance(data, bytes):
-            self._underlying = io.BytesIO(data)
-            self._length = len(data)
+        self._view = None
+        self._underlying = None
+        file_size = _regular_file_size(data)
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            self._view = memoryview(data).cast("B")
+            self._length = len(self._view)
         elif hasattr(data, "info"):
             self._underlying = data
             self._length = int(data.info()["Content-Length"])
-        elif hasattr(data, "fileno"):
+        elif file_size is not None:
             self._underlying = data
-            self._length = os.fstat(data.fileno()).st_size
+            self._length = file_size
         elif hasattr(data, "_content_length"):
             self._underlying = data
             self._length = data._content_length
         elif isinstance(data, dict) and "Body" in data and "ContentLength" in data:
             self._underlying = data["Body"]
             self._length = data["ContentLength"]
+        elif hasattr(data, "seekable") and data.seekable():
+            # e.g. BytesIO, the size is known without reading the data, from the current position to the end
+            self._underlying = data
+            position = data.tell()
+            self._length = data.seek(0, io.SEEK_END) - position
+            data.seek(position)
         else:
-            raise TypeError("data must be a bytes, file, or urllib response")
+            raise TypeError("data must be a bytes-like object, file, seekable stream, or urllib response")
         self._chunk_size = chunk_size
         self._remaining = 0
+        seekable = getattr(self._underlying, "seekable", None)
+        # chunks of a seekable stream can be rewound, e.g. by urllib3 to resend a chunk on retry
+        self._rewindable = bool(seekable and seekable())
+
+    @property
+    def independent_chunks(self) -> bool:
+        """in memory chunks can be read in any order, chunks of a stream share the stream's position"""
+        return self._view is not None
 
     def __len__(self):
         return max(1, (self._length + self._chunk_size - 1) // self._chunk_size)
 
     def __iter__(self):
+        if self._view is not None:
+            for start in range(0, max(self._length, 1), self._chunk_size):
+                yield _BufferReader(self._view[start : start + self._chunk_size])
+            return
+
         for i in range(len(self)):
             if self._remaining > 0:
                 warnings.warn(
@@ -197,6 +368,8 @@ class SplitStream(CloseUnderlyingMixin):
 class _SplitChunk(IteratorMixin):
     def __init__(self, owner):
         self._owner = owner
+        self._length = owner._remaining
+        self._start = owner._underlying.tell() if owner._rewindable else None
 
     def read(self, n=-1):
         if n == -1:
@@ -211,6 +384,23 @@ class _SplitChunk(IteratorMixin):
     def __len__(self):
         return self._owner._remaining
 
+    def seekable(self) -> bool:
+        return self._start is not None
+
+    def tell(self) -> int:
+        # always available, requests relies on tell() to work out the Content-Length of the remaining data
+        return cast(int, self._length - self._owner._remaining)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if self._start is None or whence != io.SEEK_SET or offset not in (0, self.tell()):
+            # the chunk shares the underlying stream, so only rewinding to the start of the chunk is supported
+            raise io.UnsupportedOperation("can only seek to the start of a chunk")
+        if offset == 0:
+            self._owner._underlying.seek(self._start)
+            self._owner._remaining = self._length
+            self._discard_lines()
+        return offset
+
 
 class CombineStreams(IteratorMixin):
     def __init__(self, streams):
@@ -220,24 +410,54 @@ class CombineStreams(IteratorMixin):
     def read(self, n=-1) -> bytes:
         if n == -1:
             n = None
-        result = io.BytesIO()
+        data_read = self._current_stream.read(n)
+        if n is not None and len(data_read) == n:
+            # usually satisfied by the current stream, return it as is rather than copying it through a buffer
+            return cast(bytes, data_read)
+
+        result = [data_read]
         try:
             while True:
+                self._close_current_stream()
+                self._current_stream = next(self._streams)
+                if n is not None:
+                    n -= len(data_read)
                 data_read = self._current_stream.read(n)
-                result.write(data_read)
-                if n is None or len(data_read) < n:
-                    self._close_current_stream()
-                    self._current_stream = next(self._streams)
-                    if n is not None:
-                        n -= len(data_read)
-                else:
-                    return result.getvalue()
+                result.append(data_read)
+                if n is not None and len(data_read) == n:
+                    return b"".join(result)
         except StopIteration:
             self._current_stream = io.BytesIO()  # Empty stream
-            return result.getvalue()
+            return b"".join(result)
+
+    def readinto(self, b) -> int:
+        view = memoryview(b).cast("B")
+        filled = 0
+        while filled < len(view):
+            readinto = getattr(self._current_stream, "readinto", None)
+            if readinto is not None:
+                # urllib3 responses and in memory chunks can fill the caller's buffer without an intermediate bytes
+                read = readinto(view[filled:]) or 0
+            else:
+                data_read = self._current_stream.read(len(view) - filled)
+                read = len(data_read)
+                view[filled : filled + read] = data_read
+            if read:
+                filled += read
+                continue
+            self._close_current_stream()
+            try:
+                self._current_stream = next(self._streams)
+            except StopIteration:
+                self._current_stream = io.BytesIO()  # Empty stream
+                break
+        return filled
 
     def close(self):
         self._close_current_stream()
+        close_streams = getattr(self._streams, "close", None)
+        if close_streams:
+            close_streams()
 
     def _close_current_stream(self):
         with contextlib.suppress(Exception):
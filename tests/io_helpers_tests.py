@@ -1,15 +1,20 @@
 import gzip
+import hashlib
 import io
 import tempfile
 from contextlib import closing
 from urllib.parse import urljoin
 from urllib.request import pathname2url, urlopen
 
+import pytest
+import requests
+
 from mesh_client.io_helpers import (
     CombineStreams,
     GzipCompressStream,
     GzipDecompressStream,
     IteratorMixin,
+    RewindableGzipCompressStream,
     SplitStream,
 )
 
@@ -18,11 +23,6 @@ def path2url(path):
     return urljoin("file:", pathname2url(path))
 
 
-try:
-    from itertools import izip  # type: ignore[attr-defined]
-except ImportError:
-    izip = zip
-
 mebibyte = 1024 * 1024
 small_chunk = 10
 
@@ -74,6 +74,42 @@ def test_gzip_compress_stream_read_all():
     assert test_decoder.read() == b"This is a short test stream"
 
 
+def test_gzip_compress_stream_compress_level():
+    data = b"This is a short test stream" * 100
+    fast = GzipCompressStream(io.BytesIO(data), compress_level=1).read()
+    best = GzipCompressStream(io.BytesIO(data)).read()
+
+    assert gzip.decompress(fast) == data
+    assert gzip.decompress(best) == data
+
+
+def test_gzip_compress_stream_hasher():
+    data = b"This is a short test stream" * 100
+    hasher = hashlib.sha256()
+    instance = GzipCompressStream(io.BytesIO(data), block_size=64, hasher=hasher)
+
+    assert gzip.decompress(instance.read()) == data
+    assert hasher.hexdigest() == hashlib.sha256(data).hexdigest()
+
+
+def test_rewindable_gzip_compress_stream():
+    data = b"This is a short test stream" * 100
+    underlying = io.BytesIO(b"skip" + data)
+    underlying.seek(4)
+    instance = RewindableGzipCompressStream(underlying, block_size=64)
+
+    first = instance.read(10)
+    assert instance.tell() == 10
+    assert instance.seek(0) == 0
+    compressed = instance.read()
+    assert compressed.startswith(first)
+    assert gzip.decompress(compressed) == data
+    assert not underlying.closed
+
+    with pytest.raises(io.UnsupportedOperation):
+        instance.seek(0, io.SEEK_END)
+
+
 def test_gzip_decompress_stream():
     underlying = io.BytesIO()
     gzwriter = gzip.GzipFile(fileobj=underlying, mode="w")
@@ -94,6 +130,23 @@ def test_gzip_decompress_stream():
     assert result == b"This is a short test stream"
 
 
+def test_gzip_decompress_stream_highly_compressed():
+    data = b"a" * mebibyte + b"b" * mebibyte
+    compressed = gzip.compress(data)
+
+    instance = GzipDecompressStream(io.BytesIO(compressed), block_size=1024)
+    result = b""
+    while True:
+        read_result = instance.read(4096)
+        if not read_result:
+            break
+        assert len(read_result) <= 4096
+        result += read_result
+
+    assert result == data
+    assert GzipDecompressStream(io.BytesIO(compressed), block_size=1024).read() == data
+
+
 def test_gzip_decompress_stream_read_all():
     underlying = io.BytesIO()
     gzwriter = gzip.GzipFile(fileobj=underlying, mode="w")
@@ -109,6 +162,13 @@ def test_gzip_decompress_stream_read_all():
     assert result == b"This is a short test stream"
 
 
+def test_gzip_decompress_stream_ignores_trailing_data():
+    compressed = gzip.compress(b"This is a short test stream") + b"trailing"
+
+    assert GzipDecompressStream(io.BytesIO(compressed), block_size=4).read() == b"This is a short test stream"
+    assert GzipDecompressStream(io.BytesIO(compressed), block_size=1024).read() == b"This is a short test stream"
+
+
 def test_split_file():
     with tempfile.TemporaryFile() as f:
         f.write(b"a" * mebibyte)
@@ -117,7 +177,7 @@ def test_split_file():
         f.seek(0)
         instance = SplitStream(f, mebibyte)
         assert len(instance) == 2
-        for m, c in izip(instance, [b"a", b"b"]):
+        for m, c in zip(instance, [b"a", b"b"]):
             assert m.read(mebibyte) == c * mebibyte
 
 
@@ -159,7 +219,7 @@ def test_split_url():
         with closing(urlopen(path2url(f.name))) as stream:
             instance = SplitStream(stream, mebibyte)
             assert len(instance) == 2
-            for m, c in izip(instance, [b"a", b"b"]):
+            for m, c in zip(instance, [b"a", b"b"]):
                 assert m.read(mebibyte) == c * mebibyte
 
 
@@ -196,7 +256,7 @@ def test_split_url_irregular_size_2():
 def test_split_bytes():
     instance = SplitStream(b"a" * small_chunk + b"b" * small_chunk, small_chunk)
     assert len(instance) == 2
-    for m, c in izip(instance, [b"a", b"b"]):
+    for m, c in zip(instance, [b"a", b"b"]):
         assert m.read(small_chunk) == c * small_chunk
 
 
@@ -220,6 +280,80 @@ def test_split_bytes_irregular_size_2():
     assert chunk2.read(small_chunk) == b"b" * (small_chunk - 1)
 
 
+def test_split_bytearray():
+    data = bytearray(b"a" * small_chunk + b"b" * small_chunk + b"c")
+    instance = SplitStream(data, small_chunk)
+    assert len(instance) == 3
+    iterator = iter(instance)
+    assert next(iterator).read(small_chunk) == b"a" * small_chunk
+    assert next(iterator).read(small_chunk) == b"b" * small_chunk
+    assert next(iterator).read(small_chunk) == b"c"
+
+
+def test_split_memoryview():
+    data = memoryview(b"a" * small_chunk + b"b" * (small_chunk - 1))
+    instance = SplitStream(data, small_chunk)
+    assert len(instance) == 2
+    for m, c, size in zip(instance, [b"a", b"b"], [small_chunk, small_chunk - 1]):
+        assert m.read() == c * size
+
+
+def test_split_bytes_chunks_are_independent():
+    instance = SplitStream(b"a" * small_chunk + b"b" * small_chunk + b"c", small_chunk)
+    chunk1, chunk2, chunk3 = list(instance)
+    assert chunk3.read() == b"c"
+    assert chunk1.read(small_chunk) == b"a" * small_chunk
+    assert chunk2.read(10) == b"b" * 10
+    chunk2.seek(0)
+    assert chunk2.read() == b"b" * small_chunk
+
+
+def test_split_empty_bytes():
+    instance = SplitStream(b"", small_chunk)
+    assert len(instance) == 1
+    assert [chunk.read() for chunk in instance] == [b""]
+
+
+def test_split_seekable_stream():
+    stream = io.BytesIO(b"skip" + b"a" * small_chunk + b"b")
+    stream.seek(4)
+    instance = SplitStream(stream, small_chunk)
+    assert len(instance) == 2
+    for m, c, size in zip(instance, [b"a", b"b"], [small_chunk, 1]):
+        assert m.read() == c * size
+
+
+def test_split_seekable_stream_rewinds_chunks():
+    stream = io.BytesIO(b"a" * small_chunk + b"b" * small_chunk)
+    instance = SplitStream(stream, small_chunk)
+    assert not instance.independent_chunks
+    for m, c in zip(instance, [b"a", b"b"]):
+        assert m.seekable()
+        assert m.read(3) == c * 3
+        assert m.tell() == 3
+        assert m.seek(0) == 0
+        assert len(m) == small_chunk
+        assert m.read() == c * small_chunk
+
+        with pytest.raises(io.UnsupportedOperation):
+            m.seek(1)
+
+
+def test_split_unseekable_stream_chunk_has_content_length():
+    body = CombineStreams([io.BytesIO(b"a" * 25)])
+    instance = SplitStream({"Body": body, "ContentLength": 25}, small_chunk)
+    chunk = next(iter(instance))
+    assert not chunk.seekable()
+    assert chunk.tell() == 0
+
+    prepared = requests.Request("POST", "http://localhost/", data=chunk).prepare()
+    assert prepared.headers["Content-Length"] == str(small_chunk)
+    assert "Transfer-Encoding" not in prepared.headers
+
+    with pytest.raises(io.UnsupportedOperation):
+        chunk.seek(0)
+
+
 def test_split_combine_stream_misaligned_with_chunk_size_1():
     instance = SplitStream(
         {"Body": CombineStreams([io.BytesIO(b"1234"), io.BytesIO(b"567890123456789")]), "ContentLength": 19}, 5
@@ -293,6 +427,26 @@ def test_combine_streams_readall():
     assert result == b"Hello" * 20
 
 
+def test_combine_streams_readinto():
+    # mix streams with and without readinto
+    streams = (
+        stream
+        for i in range(5)
+        for stream in (io.BytesIO(b"Hello"), GzipDecompressStream(io.BytesIO(gzip.compress(b"Hello"))), io.BytesIO())
+    )
+    instance = CombineStreams(streams)
+    buffer = bytearray(8)
+    result = b""
+    while True:
+        read = instance.readinto(buffer)
+        result += buffer[:read]
+        if read < len(buffer):
+            break
+
+    assert instance.readinto(buffer) == 0
+    assert result == b"Hello" * 10
+
+
 def test_iterator_mixin():
     # import pudb
     # pu.db
@@ -318,3 +472,22 @@ def test_iterator_mixin_list():
         b"aaaaa\n",
         b"aaaaaa\n",
     ]
+
+
+def test_iterator_mixin_readline_then_readlines():
+    instance = FakeMixinUser(MIXIN_DATA, 4)
+    assert instance.readline() == b"a\n"
+    assert instance.readlines() == [b"aa\n", b"aaa\n", b"aaaa\n", b"aaaaa\n", b"aaaaaa\n"]
+
+
+def test_iterator_mixin_long_and_empty_lines():
+    data = b"x" * 100 + b"\n\n" + b"y" * 10
+    assert list(FakeMixinUser(data, 4)) == [b"x" * 100 + b"\n", b"\n", b"y" * 10]
+    assert list(FakeMixinUser(b"", 4)) == []
+
+
+def test_iterator_mixin_readline_then_iterate():
+    instance = FakeMixinUser(MIXIN_DATA, 4)
+    assert instance.readline() == b"a\n"
+    assert list(instance) == [b"aa\n", b"aaa\n", b"aaaa\n", b"aaaaa\n", b"aaaaaa\n"]
+    assert instance.readline() == b""
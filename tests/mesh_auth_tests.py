@@ -0,0 +1,64 @@
+import hmac
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import sha256
+from unittest import mock
+
+from mesh_client import AuthTokenGenerator
+
+shared_key = b"TestKey"
+mailbox = "MAILBOX01"
+password = "password"
+
+
+def _parse_token(token: str):
+    scheme, auth_data = token.split(" ", 1)
+    assert scheme == "NHSMESH"
+    token_mailbox, nonce, nonce_count, timestamp, token_hash = auth_data.split(":")
+    return token_mailbox, nonce, nonce_count, timestamp, token_hash
+
+
+def test_generate_token_hash():
+    generator = AuthTokenGenerator(shared_key, mailbox, password)
+
+    token_mailbox, nonce, nonce_count, timestamp, token_hash = _parse_token(generator.generate_token())
+
+    assert token_mailbox == mailbox
+    expected = hmac.HMAC(
+        shared_key, f"{mailbox}:{nonce}:{nonce_count}:{password}:{timestamp}".encode("ASCII"), sha256
+    ).hexdigest()
+    assert token_hash == expected
+
+
+def test_generate_token_nonce_count_increments():
+    generator = AuthTokenGenerator(shared_key, mailbox, password)
+
+    tokens = [_parse_token(generator.generate_token()) for _ in range(3)]
+
+    assert [token[2] for token in tokens] == ["0", "1", "2"]
+    assert len({token[1] for token in tokens}) == 1
+    assert len({token[4] for token in tokens}) == 3
+
+
+def test_generate_token_timestamp():
+    generator = AuthTokenGenerator(shared_key, mailbox, password)
+
+    # 2023-11-14 22:13:20 UTC
+    with mock.patch("time.time", return_value=1700000000.0):
+        first = _parse_token(generator.generate_token())
+    with mock.patch("time.time", return_value=1700000039.0):
+        second = _parse_token(generator.generate_token())
+    with mock.patch("time.time", return_value=1700000040.0):
+        third = _parse_token(generator.generate_token())
+
+    assert first[3] == "202311142213"
+    assert second[3] == "202311142213"
+    assert third[3] == "202311142214"
+
+
+def test_generate_token_nonce_count_unique_across_threads():
+    generator = AuthTokenGenerator(shared_key, mailbox, password)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        tokens = list(executor.map(lambda _: _parse_token(generator.generate_token()), range(1000)))
+
+    assert sorted(int(token[2]) for token in tokens) == list(range(1000))
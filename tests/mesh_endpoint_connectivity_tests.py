@@ -8,7 +8,7 @@ from requests.exceptions import HTTPError, SSLError
 
 import mesh_client
 from mesh_client import DEPRECATED_HSCN_INT_ENDPOINT, Endpoint, MeshClient
-from tests.helpers import MOCK_CERT, MOCK_KEY, temp_env_vars
+from tests.helpers import MOCK_CA_CERT, MOCK_CERT, MOCK_KEY, temp_env_vars
 
 
 def _host_resolves(endpoint: Endpoint):
@@ -237,3 +237,17 @@ def test_internet_endpoints_via_ambient_proxy(name: str, endpoint: Endpoint):
     # the internet endpoints behave differently they will not return a 400 bad request
     # in this case, TLSV1_ALERT_UNKNOWN_CA actually means "I don't accept this client certificate"
     assert err.value.args[0].reason.args[0].reason == "TLSV1_ALERT_UNKNOWN_CA"
+
+
+def test_ssl_contexts_are_shared_between_adapters_with_the_same_settings():
+    first = mesh_client.SSLContextAdapter((MOCK_CERT, MOCK_KEY), MOCK_CA_CERT, True, None)
+    second = mesh_client.SSLContextAdapter((MOCK_CERT, MOCK_KEY), MOCK_CA_CERT, True, None)
+    assert first._get_ssl_context() is second._get_ssl_context()
+
+
+def test_ssl_contexts_with_a_key_password_are_not_shared():
+    mesh_client._shared_ssl_context.cache_clear()
+    first = mesh_client.SSLContextAdapter((MOCK_CERT, MOCK_KEY, "password"), MOCK_CA_CERT, True, None)
+    second = mesh_client.SSLContextAdapter((MOCK_CERT, MOCK_KEY, "password"), MOCK_CA_CERT, True, None)
+    assert first._get_ssl_context() is not second._get_ssl_context()
+    assert mesh_client._shared_ssl_context.cache_info().currsize == 0
@@ -1,3 +1,4 @@
+import gzip
 import os.path
 import re
 from collections import defaultdict
@@ -10,8 +11,8 @@ from pytest_httpserver import HTTPServer
 from requests import HTTPError
 from werkzeug import Request
 
-from mesh_client import MeshClient, SendMessageResponse_v2
-from tests.helpers import default_ssl_opts, json_response, plain_response
+from mesh_client import MeshClient, SendMessageResponse_v2, _JSONDecodeError
+from tests.helpers import bytes_response, default_ssl_opts, json_response, plain_response
 
 alice_mailbox = "alice"
 alice_password = "password"
@@ -169,3 +170,84 @@ def test_chunk_retries_with_file(httpserver: HTTPServer, alice: MeshClient, bob:
 
     received = b"".join(received_chunks)
     assert received == send_bytes[:5]
+
+
+@pytest.mark.parametrize("compress", [True, False])
+def test_send_single_chunk(httpserver: HTTPServer, alice: MeshClient, compress: bool):
+    message_id = uuid4().hex.upper()
+    received: List[Request] = []
+
+    def send_handler(request: Request):
+        received.append(request)
+        return json_response({"message_id": message_id}, status=202)
+
+    httpserver.expect_request(f"{alice.mailbox_path}/outbox", method="POST").respond_with_handler(send_handler)
+
+    assert alice.send_message(bob_mailbox, b"Hello", compress=compress) == message_id
+
+    assert len(received) == 1
+    assert received[0].headers["mex-chunk-range"] == "1:1"
+    body = received[0].get_data()
+    assert (gzip.decompress(body) if compress else body) == b"Hello"
+
+
+class _Pipe:
+    """a readable of unknown size, which returns short reads"""
+
+    def __init__(self, data: bytes):
+        self._data = data
+
+    def read(self, n: int = -1) -> bytes:
+        n = min(3, len(self._data) if n < 0 else n)
+        block, self._data = self._data[:n], self._data[n:]
+        return block
+
+
+@pytest.mark.parametrize("send_bytes", [b"Hello", b"test1 test2 test3"])
+def test_send_message_unsized_stream(httpserver: HTTPServer, alice: MeshClient, send_bytes: bytes):
+    message_id = uuid4().hex.upper()
+    received: Dict[int, Request] = {}
+
+    def send_chunk_handler(request: Request):
+        last_path = request.path.split("/")[-1]
+        chunk_num = int(last_path) if last_path.isdigit() else 1
+        received[chunk_num] = request
+        if chunk_num == 1:
+            return json_response({"message_id": message_id}, status=202)
+        return plain_response("")
+
+    send_re = re.compile(rf"^{alice.mailbox_path}/outbox(/{message_id}/\d+)?")
+    httpserver.expect_request(send_re, method="POST").respond_with_handler(send_chunk_handler)
+
+    assert alice.send_message(bob_mailbox, _Pipe(send_bytes)) == message_id
+
+    total_chunks = (len(send_bytes) + 4) // 5
+    assert sorted(received) == list(range(1, total_chunks + 1))
+    assert received[1].headers["mex-chunk-range"] == f"1:{total_chunks}"
+    assert b"".join(received[chunk_num].get_data() for chunk_num in sorted(received)) == send_bytes
+
+
+def test_send_message_invalid_json_response(httpserver: HTTPServer, alice: MeshClient):
+    httpserver.expect_request(f"{alice.mailbox_path}/outbox", method="POST").respond_with_response(
+        plain_response("<html>not json</html>", status=202)
+    )
+
+    with pytest.raises(_JSONDecodeError):
+        alice.send_message(bob_mailbox, b"Hello")
+
+
+def test_send_message_json_response_declared_charset(httpserver: HTTPServer, alice: MeshClient):
+    httpserver.expect_request(f"{alice.mailbox_path}/outbox", method="POST").respond_with_response(
+        bytes_response(b'{"message_id": "ID\xe9"}', status=202, content_type="application/json; charset=iso-8859-1")
+    )
+
+    assert alice.send_message(bob_mailbox, b"Hello") == "ID\u00e9"
+
+
+def test_headers_for_chunk_rejects_unknown_kwargs():
+    headers = MeshClient._headers_for_chunk("bob", 1, 1, False, workflow_id="TEST", encrypted=True)
+    assert headers["Mex-WorkflowID"] == "TEST"
+    assert headers["Mex-Content-Encrypted"] == "Y"
+
+    with pytest.raises(TypeError, match=r"Unrecognised keyword argument 'not_a_header'.*workflow_id"):
+        MeshClient._headers_for_chunk("bob", 1, 1, False, not_a_header="x")
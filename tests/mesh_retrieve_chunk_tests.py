@@ -0,0 +1,230 @@
+import gzip
+from concurrent.futures import ThreadPoolExecutor
+from uuid import uuid4
+
+import pytest
+from pytest_httpserver import HTTPServer
+from requests import HTTPError
+
+from mesh_client import MeshClient
+from tests.helpers import bytes_response, default_ssl_opts
+
+bob_mailbox = "bob"
+bob_password = "password"
+
+chunks = [b"Hello ", b"from ", b"a ", b"chunked ", b"message"]
+
+
+def _expect_chunks(httpserver: HTTPServer, client: MeshClient, message_id: str, compress: bool):
+    for chunk_num, chunk in enumerate(chunks, start=1):
+        path = f"{client.mailbox_path}/inbox/{message_id}"
+        if chunk_num > 1:
+            path = f"{path}/{chunk_num}"
+        headers = {"mex-chunk-range": f"{chunk_num}:{len(chunks)}", "mex-messageid": message_id}
+        if compress:
+            headers["Content-Encoding"] = "gzip"
+        httpserver.expect_request(path, method="GET").respond_with_response(
+            bytes_response(
+                response=gzip.compress(chunk) if compress else chunk,
+                status=200 if chunk_num == len(chunks) else 206,
+                headers=headers,
+            )
+        )
+
+
+@pytest.mark.parametrize("compress", [True, False])
+@pytest.mark.parametrize(("parallel_decompress", "max_parallel_chunks"), [(True, 1), (False, 1), (False, 3)])
+def test_retrieve_chunked_message(
+    httpserver: HTTPServer, compress: bool, parallel_decompress: bool, max_parallel_chunks: int
+):
+    message_id = uuid4().hex.upper()
+
+    with MeshClient(
+        httpserver.url_for(""),
+        bob_mailbox,
+        bob_password,
+        max_retries=0,
+        parallel_decompress=parallel_decompress,
+        max_parallel_chunks=max_parallel_chunks,
+        **default_ssl_opts,  # type: ignore[arg-type]
+    ) as bob:
+        _expect_chunks(httpserver, bob, message_id, compress)
+        httpserver.expect_request(
+            f"{bob.mailbox_path}/inbox/{message_id}/status/acknowledged", method="PUT"
+        ).respond_with_json({})
+
+        with bob.retrieve_message(message_id) as message:
+            assert message.read() == b"".join(chunks)
+            assert message.message_id == message_id
+
+
+@pytest.mark.parametrize(("parallel_decompress", "max_parallel_chunks"), [(True, 1), (False, 3)])
+def test_retrieve_chunked_message_close_early(
+    httpserver: HTTPServer, parallel_decompress: bool, max_parallel_chunks: int
+):
+    message_id = uuid4().hex.upper()
+
+    with MeshClient(
+        httpserver.url_for(""),
+        bob_mailbox,
+        bob_password,
+        max_retries=0,
+        parallel_decompress=parallel_decompress,
+        max_parallel_chunks=max_parallel_chunks,
+        **default_ssl_opts,  # type: ignore[arg-type]
+    ) as bob:
+        _expect_chunks(httpserver, bob, message_id, compress=True)
+
+        message = bob.retrieve_message(message_id)
+        assert message.read(8) == b"Hello fr"
+        message.close()
+
+
+def test_retrieve_message_headers(httpserver: HTTPServer):
+    message_id = uuid4().hex.upper()
+
+    with MeshClient(
+        httpserver.url_for(""),
+        bob_mailbox,
+        bob_password,
+        max_retries=0,
+        **default_ssl_opts,  # type: ignore[arg-type]
+    ) as bob:
+        httpserver.expect_request(f"{bob.mailbox_path}/inbox/{message_id}", method="GET").respond_with_response(
+            bytes_response(
+                response=b"Hello",
+                headers={
+                    "mex-messageid": message_id,
+                    "Mex-From": "alice",
+                    "MEX-WORKFLOWID": "TEST_WORKFLOW",
+                    "mex-content-compressed": "y",
+                    "mex-content-encrypted": "false",
+                    "mex-custom": "custom value",
+                },
+                content_type="text/plain",
+            )
+        )
+
+        message = bob.retrieve_message(message_id)
+
+        assert message.message_id == message_id
+        assert message.sender == "alice"
+        assert message.workflow_id == "TEST_WORKFLOW"
+        assert message.compressed is True
+        assert message.encrypted is False
+        assert message.subject is None
+        assert message.content_type == "text/plain"
+        assert message.mex_header("custom") == "custom value"
+        assert message.read() == b"Hello"
+        message.close()
+
+
+def test_batched_acks(httpserver: HTTPServer):
+    message_ids = [uuid4().hex.upper() for _ in range(3)]
+
+    with MeshClient(
+        httpserver.url_for(""),
+        bob_mailbox,
+        bob_password,
+        max_retries=0,
+        **default_ssl_opts,  # type: ignore[arg-type]
+    ) as bob:
+        for message_id in message_ids:
+            httpserver.expect_request(f"{bob.mailbox_path}/inbox/{message_id}", method="GET").respond_with_response(
+                bytes_response(response=b"Hello", headers={"mex-messageid": message_id})
+            )
+
+        with bob.batched_acks():
+            for message_id in message_ids:
+                with bob.retrieve_message(message_id) as message:
+                    assert message.read() == b"Hello"
+            assert not [request for request, _ in httpserver.log if request.method == "PUT"]
+
+            for message_id in message_ids:
+                httpserver.expect_request(
+                    f"{bob.mailbox_path}/inbox/{message_id}/status/acknowledged", method="PUT"
+                ).respond_with_json({})
+
+        acknowledged = sorted(request.path for request, _ in httpserver.log if request.method == "PUT")
+        assert acknowledged == sorted(
+            f"{bob.mailbox_path}/inbox/{message_id}/status/acknowledged" for message_id in message_ids
+        )
+
+
+def test_batched_acks_keeps_the_block_error_when_acks_fail(httpserver: HTTPServer):
+    message_id = uuid4().hex.upper()
+
+    with MeshClient(
+        httpserver.url_for(""),
+        bob_mailbox,
+        bob_password,
+        max_retries=0,
+        **default_ssl_opts,  # type: ignore[arg-type]
+    ) as bob:
+        httpserver.expect_request(f"{bob.mailbox_path}/inbox/{message_id}", method="GET").respond_with_response(
+            bytes_response(response=b"Hello", headers={"mex-messageid": message_id})
+        )
+        httpserver.expect_request(
+            f"{bob.mailbox_path}/inbox/{message_id}/status/acknowledged", method="PUT"
+        ).respond_with_data("", status=500)
+
+        def process_inbox():
+            with bob.batched_acks():
+                with bob.retrieve_message(message_id) as message:
+                    assert message.read() == b"Hello"
+                raise ValueError("processing failed")
+
+        with pytest.raises(ValueError, match="processing failed") as error:
+            process_inbox()
+
+        assert isinstance(error.value.__cause__, HTTPError)
+
+
+def test_batched_acks_only_defers_the_batching_thread(httpserver: HTTPServer):
+    message_id = uuid4().hex.upper()
+
+    with MeshClient(
+        httpserver.url_for(""),
+        bob_mailbox,
+        bob_password,
+        max_retries=0,
+        **default_ssl_opts,  # type: ignore[arg-type]
+    ) as bob:
+        httpserver.expect_request(f"{bob.mailbox_path}/inbox/{message_id}", method="GET").respond_with_response(
+            bytes_response(response=b"Hello", headers={"mex-messageid": message_id})
+        )
+        httpserver.expect_request(
+            f"{bob.mailbox_path}/inbox/{message_id}/status/acknowledged", method="PUT"
+        ).respond_with_json({})
+
+        with bob.batched_acks(), ThreadPoolExecutor(max_workers=1) as executor:
+            message = bob.retrieve_message(message_id)
+            executor.submit(message.acknowledge).result()
+            # acknowledged straight away on the other thread, rather than queued in this thread's batch
+            assert [request.path for request, _ in httpserver.log if request.method == "PUT"] == [
+                f"{bob.mailbox_path}/inbox/{message_id}/status/acknowledged"
+            ]
+            message.close()
+
+
+@pytest.mark.parametrize("prefetch_next_page", [True, False])
+def test_iterate_message_ids_pages(httpserver: HTTPServer, prefetch_next_page: bool):
+    pages = [[uuid4().hex.upper() for _ in range(3)] for _ in range(3)]
+
+    with MeshClient(
+        httpserver.url_for(""),
+        bob_mailbox,
+        bob_password,
+        max_retries=0,
+        **default_ssl_opts,  # type: ignore[arg-type]
+    ) as bob:
+        inbox_path = f"{bob.mailbox_path}/inbox"
+        for page_num, page in enumerate(pages):
+            links = {"next": f"{inbox_path}?continue_from={page_num + 1}"} if page_num < len(pages) - 1 else {}
+            httpserver.expect_request(
+                inbox_path, method="GET", query_string=f"continue_from={page_num}" if page_num else ""
+            ).respond_with_json({"messages": page, "links": links})
+
+        message_ids = list(bob.iterate_message_ids(prefetch_next_page=prefetch_next_page))
+
+    assert message_ids == [message_id for page in pages for message_id in page]
@@ -1,7 +1,9 @@
+import gzip
 import os.path
 import re
 import sys
 from collections import defaultdict
+from io import BytesIO
 from time import sleep
 from typing import Dict, List, cast
 from uuid import uuid4
@@ -152,6 +154,54 @@ def test_chunk_retries(httpserver: HTTPServer, alice: MeshClient, bob: MeshClien
     assert chunk_call_counts[3] == 1
 
 
+def test_chunk_retries_with_seekable_chunk(httpserver: HTTPServer, alice: MeshClient):
+    message_id = uuid4().hex.upper()
+
+    chunk_call_counts: Dict[int, int] = defaultdict(int)
+    received_chunks: List[bytes] = []
+
+    def send_chunk_handler(request: Request):
+        chunk_call_counts[2] += 1
+        if chunk_call_counts[2] < 3:
+            return plain_response("", status=502)
+        received_chunks.append(request.data)
+        return plain_response("")
+
+    httpserver.expect_request(f"{alice.mailbox_path}/outbox/{message_id}/2", method="POST").respond_with_handler(
+        send_chunk_handler
+    )
+
+    chunk = BytesIO(b"skip World")
+    chunk.seek(5)
+    alice.send_chunk(bob_mailbox, chunk, chunk_num=2, total_chunks=2, compress=False, message_id=message_id)
+
+    assert chunk_call_counts[2] == 3
+    assert received_chunks == [b"World"]
+
+
+def test_chunk_retries_with_compressed_chunk(httpserver: HTTPServer, alice: MeshClient):
+    message_id = uuid4().hex.upper()
+
+    chunk_call_counts: Dict[int, int] = defaultdict(int)
+    received_chunks: List[bytes] = []
+
+    def send_chunk_handler(request: Request):
+        chunk_call_counts[2] += 1
+        if chunk_call_counts[2] < 3:
+            return plain_response("", status=502)
+        received_chunks.append(gzip.decompress(request.data))
+        return plain_response("")
+
+    httpserver.expect_request(f"{alice.mailbox_path}/outbox/{message_id}/2", method="POST").respond_with_handler(
+        send_chunk_handler
+    )
+
+    alice.send_chunk(bob_mailbox, b"World" * 1000, chunk_num=2, total_chunks=2, compress=True, message_id=message_id)
+
+    assert chunk_call_counts[2] == 3
+    assert received_chunks == [b"World" * 1000]
+
+
 def test_chunk_all_retries_fail(httpserver: HTTPServer, alice: MeshClient, bob: MeshClient):
     message_id = uuid4().hex.upper()
 
@@ -255,3 +305,87 @@ def test_chunk_retries_with_file(httpserver: HTTPServer, alice: MeshClient, bob:
 
     received = b"".join(received_chunks)
     assert received == send_bytes
+
+
+def test_concurrent_chunk_upload(httpserver: HTTPServer, bob: MeshClient):
+    message_id = uuid4().hex.upper()
+
+    send_bytes = b"test1 test2 test3 test4 test5 test6"
+
+    chunk_call_counts: Dict[int, int] = defaultdict(int)
+    received_chunks: Dict[int, bytes] = {}
+    auth_headers: List[str] = []
+
+    def send_chunk_handler(request: Request):
+        last_path = request.path.split("/")[-1]
+
+        chunk_num = int(last_path) if last_path.isdigit() else 1
+        chunk_call_counts[chunk_num] += 1
+        auth_headers.append(request.headers["Authorization"])
+
+        if chunk_num == 3 and chunk_call_counts[chunk_num] < 2:
+            return plain_response("", status=502)
+
+        received_chunks[chunk_num] = request.data
+
+        if chunk_num == 1:
+            return json_response(cast(SendMessageResponse_v2, {"message_id": message_id}), status=202)
+
+        return plain_response("")
+
+    with MeshClient(
+        httpserver.url_for(""),
+        alice_mailbox,
+        alice_password,
+        max_chunk_size=5,
+        retry_backoff_factor=0.01,
+        max_parallel_chunks=3,
+        **default_ssl_opts,  # type: ignore[arg-type]
+    ) as alice:
+        send_re = re.compile(rf"^{alice.mailbox_path}/outbox(/{message_id}/\d+)?")
+        httpserver.expect_request(send_re, method="POST").respond_with_handler(send_chunk_handler)
+
+        message_id_received = alice.send_message(bob_mailbox, send_bytes)
+
+    assert message_id_received == message_id
+    assert sorted(received_chunks) == list(range(1, 8))
+    assert b"".join(received_chunks[chunk_num] for chunk_num in sorted(received_chunks)) == send_bytes
+    assert chunk_call_counts[3] == 2
+    # each chunk must have been signed with a distinct nonce count ( urllib3 retries resend the same token )
+    assert len(set(auth_headers)) == len(received_chunks)
+
+
+def test_concurrent_chunk_upload_raises_first_failed_chunk(httpserver: HTTPServer):
+    message_id = uuid4().hex.upper()
+
+    def send_chunk_handler(request: Request):
+        last_path = request.path.split("/")[-1]
+        chunk_num = int(last_path) if last_path.isdigit() else 1
+
+        if chunk_num == 1:
+            return json_response({"message_id": message_id}, status=202)
+
+        if chunk_num == 2:
+            # fail after chunk 4, the earlier chunk's error should still be the one raised
+            sleep(0.2)
+        if chunk_num in (2, 4):
+            return plain_response("", status=400)
+
+        return plain_response("")
+
+    with MeshClient(
+        httpserver.url_for(""),
+        alice_mailbox,
+        alice_password,
+        max_chunk_size=5,
+        retry_backoff_factor=0.01,
+        max_parallel_chunks=3,
+        **default_ssl_opts,  # type: ignore[arg-type]
+    ) as alice:
+        send_re = re.compile(rf"^{alice.mailbox_path}/outbox(/{message_id}/\d+)?")
+        httpserver.expect_request(send_re, method="POST").respond_with_handler(send_chunk_handler)
+
+        with pytest.raises(requests.HTTPError) as error:
+            alice.send_message(bob_mailbox, b"test1 test2 test3 test4 test5 test6 test7")
+
+    assert error.value.response.url.endswith(f"/outbox/{message_id}/2")
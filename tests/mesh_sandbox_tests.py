@@ -220,6 +220,20 @@ def test_iterate_and_context_manager(alice: MeshClient, bob: MeshClient):
     assert bob.list_messages() == []
 
 
+def test_iterate_prefetch(alice: MeshClient, bob: MeshClient):
+    expected = [f"Hello Bob {i}".encode() for i in range(5)]
+    for message in expected:
+        alice.send_message(bob_mailbox, message, workflow_id=uuid4().hex)
+
+    received = []
+    for msg in bob.iterate_all_messages(prefetch=2):
+        with msg:
+            received.append(msg.read())
+
+    assert sorted(received) == expected
+    assert bob.list_messages() == []
+
+
 def test_context_manager_failure(alice: MeshClient, bob: MeshClient):
     message_id = alice.send_message(bob_mailbox, b"Hello Bob 4", workflow_id=uuid4().hex)
     try: